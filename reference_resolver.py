@@ -57,15 +57,15 @@ class ReferenceResolver:
         Processes the entire document to find and resolve all references.
         """
         resolved_citations = []
-        # self.document_pointers is now a list of dicts
+        # self.document_pointers is a list of xml_parser.Pointer records
         logging.info(f"RR: Starting resolve_references. Document pointers available: {len(self.document_pointers)}")
         
         # The main loop now iterates through the contextual pointers from XMLParser
         for i, pointer_info in enumerate(self.document_pointers):
-            target_id = pointer_info["target_id"]
-            in_text_citation_string = pointer_info["in_text_citation_string"]
+            target_id = pointer_info.target_id
+            in_text_citation_string = pointer_info.in_text_citation_string
             # context_text is the paragraph-level context from XMLParser
-            context_text_from_parser = pointer_info["context_text"]
+            context_text_from_parser = pointer_info.context_text
 
             logging.debug(f"RR: Processing pointer {i+1}/{len(self.document_pointers)}: target_id='{target_id}', text='{in_text_citation_string}', context='{context_text_from_parser[:100]}...'")
 
@@ -93,7 +93,7 @@ class ReferenceResolver:
                         "in_text_citation_string": in_text_citation_string,
                         "bibliography_entry_text": full_ref_text,
                         "target_id_from_bib": target_id
-                        # Optional: could add pointer_info["citation_tag_name"], pointer_info["citation_tag_attributes"]
+                        # Optional: could add pointer_info.citation_tag_name, pointer_info.citation_tag_attributes
                     }
                     resolved_citations.append(citation_data)
                     logging.info(f"RR: Added resolved link: TargetID='{target_id}', Pointer='{in_text_citation_string}', Context='{context_text_from_parser[:50]}...'")
@@ -1,10 +1,11 @@
 import unittest
-from xml_parser import XMLParser # Assuming xml_parser.py is in the same directory or PYTHONPATH
+from xml_parser import XMLParser, extract_pointers, extract_pointers_batch, parse_one_xml, parse_xml_batch, parse_paths_streaming # Assuming xml_parser.py is in the same directory or PYTHONPATH
 
 # Helper to create a temporary XML file for the parser
 import tempfile
 import os
 import re # For Wiley pointer test
+from unittest import mock
 
 class TestXMLParser(unittest.TestCase):
 
@@ -22,13 +23,13 @@ class TestXMLParser(unittest.TestCase):
         self.temp_file.truncate()
         self.temp_file.write(xml_content)
         self.temp_file.flush()
-        # Ensure parser_used_for_soup is set for get_full_text fallback logic
+        # Ensure parser_used is set for get_full_text fallback logic
         parser = XMLParser(self.temp_file_path)
-        # The XMLParser.__init__ should set self.parser_used_for_soup if parsing is successful.
+        # The XMLParser.__init__ should set self.parser_used if parsing is successful.
         # This check is a fallback for tests if some edge case in XMLParser init fails to set it,
-        # though ideally XMLParser itself should always set it if self.soup is not None.
-        if parser.soup and not parser.parser_used_for_soup:
-            parser.parser_used_for_soup = 'lxml-xml' # Default to a common one for test purposes if soup exists but attr missing
+        # though ideally XMLParser itself should always set it if self.root is not None.
+        if parser.root is not None and not parser.parser_used:
+            parser.parser_used = 'lxml-xml' # Default to a common one for test purposes if root exists but attr missing
         return parser
 
     def test_jats_parsing(self):
@@ -53,7 +54,7 @@ class TestXMLParser(unittest.TestCase):
         </article>
         """
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
         # Test initial schema detection
         self.assertEqual(parser.schema_type, "jats", f"Initial schema detection failed for JATS. Detected: {parser.schema_type}")
 
@@ -80,28 +81,136 @@ class TestXMLParser(unittest.TestCase):
 
         found_targets = set()
         for ptr_info in contextual_pointers:
-            self.assertIn("target_id", ptr_info)
-            self.assertIn("in_text_citation_string", ptr_info)
-            self.assertIn("context_text", ptr_info)
-            self.assertIn("citation_tag_name", ptr_info)
-            self.assertIn("citation_tag_attributes", ptr_info)
+            self.assertTrue(hasattr(ptr_info, "target_id"))
+            self.assertTrue(hasattr(ptr_info, "in_text_citation_string"))
+            self.assertTrue(hasattr(ptr_info, "context_text"))
+            self.assertTrue(hasattr(ptr_info, "citation_tag_name"))
+            self.assertTrue(hasattr(ptr_info, "citation_tag_attributes"))
 
-            target_id = ptr_info["target_id"]
+            target_id = ptr_info.target_id
             found_targets.add(target_id)
             self.assertIn(target_id, expected_pointers_summary, f"Unexpected target_id {target_id} found.")
-            self.assertEqual(ptr_info["in_text_citation_string"], expected_pointers_summary[target_id])
+            self.assertEqual(ptr_info.in_text_citation_string, expected_pointers_summary[target_id])
 
-            if ptr_info["in_text_citation_string"] == f"[{ptr_info['target_id']}]" and target_id == "b3": # Specifically for the empty <xref rid="b3"/>
-                self.assertTrue(len(ptr_info["context_text"]) > 0, f"Context text should be present for empty tag {target_id}")
-                # self.assertNotIn("[b3]", ptr_info["context_text"], "Generated text for empty tag should not be in context (JATS b3)")
+            if ptr_info.in_text_citation_string == f"[{ptr_info.target_id}]" and target_id == "b3": # Specifically for the empty <xref rid="b3"/>
+                self.assertTrue(len(ptr_info.context_text) > 0, f"Context text should be present for empty tag {target_id}")
+                # self.assertNotIn("[b3]", ptr_info.context_text, "Generated text for empty tag should not be in context (JATS b3)")
             else:
-                self.assertIn(ptr_info["in_text_citation_string"], ptr_info["context_text"],
-                              f"In-text string '{ptr_info['in_text_citation_string']}' not in context '{ptr_info['context_text']}' for {target_id}")
+                self.assertIn(ptr_info.in_text_citation_string, ptr_info.context_text,
+                              f"In-text string '{ptr_info.in_text_citation_string}' not in context '{ptr_info.context_text}' for {target_id}")
 
-            self.assertEqual(ptr_info["citation_tag_name"], "xref")
+            self.assertEqual(ptr_info.citation_tag_name, "xref")
 
         self.assertEqual(found_targets, set(expected_pointers_summary.keys()), "Not all expected targets were found.")
 
+    def test_jats_full_text_nested_body_not_doubled(self):
+        xml_content = """<?xml version="1.0"?>
+        <article article-type="research-article">
+            <article-text>
+                <body><p>Nested JATS body text.</p></body>
+            </article-text>
+            <back><ref-list><ref id="b1"><label>1</label><mixed-citation>Nested ref content.</mixed-citation></ref></ref-list></back>
+        </article>
+        """
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.schema_type, "jats")
+        full_text = parser.get_full_text()
+        self.assertEqual(full_text.count("Nested JATS body text."), 1, f"Body text should appear exactly once: {full_text}")
+        self.assertNotIn("Nested ref content", full_text)
+
+    def test_leading_junk_is_skipped_before_parsing(self):
+        # Recovering XML parsing returns no root at all when text precedes the first tag
+        xml_content = """junk<article article-type="research-article">
+            <front><article-meta><title-group><article-title>FRONT TITLE</article-title></title-group></article-meta></front>
+            <body><p>Junk-prefixed text <xref ref-type="bibr" rid="r1">[1]</xref>.</p></body>
+            <back><ack><p>ACK TEXT</p></ack><ref-list><ref id="r1"><label>1</label><mixed-citation>Junk ref.</mixed-citation></ref></ref-list></back>
+        </article>"""
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.parser_used, "lxml-xml")
+        self.assertEqual(parser.schema_type, "jats")
+        self.assertEqual(parser.get_bibliography_map(), {"1": "Junk ref."})
+        self.assertEqual(parser.get_full_text(), "Junk-prefixed text [1] .")
+        self.assertEqual([p.target_id for p in parser.get_pointer_map()], ["r1"])
+
+        # xml:id keeps its namespace, which the HTML parser would drop
+        xml_content = """junk<component xmlns="http://www.wiley.com/namespaces/wiley">
+            <body><p>Wiley text <link href="#b1">(C, 2020)</link>.</p></body>
+            <bibliography><bib xml:id="b1"><citation>C1</citation></bib></bibliography>
+        </component>"""
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.schema_type, "wiley")
+        self.assertEqual(parser.get_bibliography_map(), {"b1": "C1"})
+
+        parser = self._write_xml_and_parse("not xml at all <p>hello <b>world</b></p>")
+        self.assertEqual(parser.parser_used, "lxml-xml")
+        self.assertEqual(parser.get_full_text(), "hello world")
+
+        # With no tag to restart from, lxml's HTML parser is the last resort
+        parser = self._write_xml_and_parse("not xml at all")
+        self.assertEqual(parser.parser_used, "lxml-html")
+        self.assertEqual(parser.get_full_text(), "not xml at all")
+
+    def test_specific_parser_memoizes_extractors(self):
+        xml_content = """<?xml version="1.0"?>
+        <article article-type="research-article">
+            <body><p>Cached text <xref ref-type="bibr" rid="b1">[1]</xref>.</p></body>
+            <back><ref-list><ref id="b1"><label>1</label><mixed-citation>Cached ref.</mixed-citation></ref></ref-list></back>
+        </article>
+        """
+        parser = self._write_xml_and_parse(xml_content)
+        specific = parser.specific_parser_instance
+        bib_map = specific.parse_bibliography()
+        pointers = specific.extract_pointers_with_context()
+        full_text = specific.extract_full_text_excluding_bib()
+        self.assertIs(specific._bib_map_cache, bib_map)
+        self.assertIs(specific._pointer_map_cache, pointers)
+        self.assertIs(specific._full_text_cache, full_text)
+        self.assertIs(specific.parse_bibliography(), bib_map)
+        self.assertIs(specific.extract_pointers_with_context(), pointers)
+        self.assertIs(parser.get_bibliography_map(), bib_map)
+        self.assertIs(parser.get_pointer_map(), pointers)
+        self.assertEqual(parser.bibliography_format_used, "jats")
+
+    def test_empty_results_are_cached(self):
+        parser = self._write_xml_and_parse("""<?xml version="1.0"?><article article-type="editorial"><body/></article>""")
+        specific = parser.specific_parser_instance
+        bib_map = specific.parse_bibliography()
+        self.assertEqual(bib_map, {})
+        self.assertIs(specific.parse_bibliography(), bib_map)
+        self.assertIs(parser.get_bibliography_map(), bib_map)
+        self.assertEqual(parser.get_pointer_map(), [])
+        self.assertIs(parser.get_pointer_map(), specific._pointer_map_cache)
+
+    def test_schema_cached_for_unchanged_file(self):
+        xml_content = """<?xml version="1.0"?>
+        <article article-type="research-article"><back><ref-list><ref id="r1"/></ref-list></back></article>
+        """
+        first = self._write_xml_and_parse(xml_content)
+        self.assertEqual(first.schema_type, "jats")
+        with mock.patch.object(XMLParser, "_sniff_schema", side_effect=AssertionError("sniffed")), \
+             mock.patch.object(XMLParser, "_detect_schema", side_effect=AssertionError("detected")):
+            second = XMLParser(self.temp_file_path)
+        self.assertEqual(second.schema_type, "jats")
+        self.assertEqual(type(second.specific_parser_instance).__name__, "JATSParser")
+
+    def test_schema_cache_is_bounded(self):
+        with mock.patch.object(XMLParser, "_SCHEMA_CACHE_SIZE", 1), \
+             mock.patch.object(XMLParser, "_schema_cache", XMLParser._schema_cache.__class__()):
+            here = os.path.dirname(os.path.abspath(__file__))
+            XMLParser(os.path.join(here, "sample_jats.xml"))
+            XMLParser(os.path.join(here, "sample_tei.xml"))
+            self.assertEqual([key[0] for key in XMLParser._schema_cache], [os.path.join(here, "sample_tei.xml")])
+
+    def test_schema_cache_shared_across_threads(self):
+        from concurrent.futures import ThreadPoolExecutor
+        here = os.path.dirname(os.path.abspath(__file__))
+        paths = [os.path.join(here, "sample_jats.xml"), os.path.join(here, "sample_tei.xml")] * 50
+        with mock.patch.object(XMLParser, "_SCHEMA_CACHE_SIZE", 1), \
+             mock.patch.object(XMLParser, "_schema_cache", XMLParser._schema_cache.__class__()), \
+             ThreadPoolExecutor(max_workers=4) as executor:
+            schemas = list(executor.map(lambda path: XMLParser(path).schema_type, paths))
+        self.assertEqual(schemas, ["jats", "tei"] * 50)
+
     def test_tei_parsing(self):
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
         <TEI xmlns="http://www.tei-c.org/ns/1.0">
@@ -125,7 +234,7 @@ class TestXMLParser(unittest.TestCase):
         </TEI>
         """
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
         self.assertEqual(parser.schema_type, "tei", f"Initial schema detection failed for TEI. Detected: {parser.schema_type}")
 
         bib_map = parser.get_bibliography_map()
@@ -150,23 +259,23 @@ class TestXMLParser(unittest.TestCase):
 
         found_targets = set()
         for ptr_info in contextual_pointers:
-            self.assertIn("target_id", ptr_info)
-            self.assertIn("in_text_citation_string", ptr_info)
-            self.assertIn("context_text", ptr_info)
-            self.assertEqual(ptr_info["citation_tag_name"], "ref") # TEI sample uses <ref>
+            self.assertTrue(hasattr(ptr_info, "target_id"))
+            self.assertTrue(hasattr(ptr_info, "in_text_citation_string"))
+            self.assertTrue(hasattr(ptr_info, "context_text"))
+            self.assertEqual(ptr_info.citation_tag_name, "ref") # TEI sample uses <ref>
 
-            target_id = ptr_info["target_id"]
+            target_id = ptr_info.target_id
             found_targets.add(target_id)
             self.assertIn(target_id, expected_pointers_summary, f"Unexpected TEI target_id {target_id} found.")
-            self.assertEqual(ptr_info["in_text_citation_string"], expected_pointers_summary[target_id])
+            self.assertEqual(ptr_info.in_text_citation_string, expected_pointers_summary[target_id])
 
-            if ptr_info["in_text_citation_string"] == f"[{ptr_info['target_id']}]" and target_id == "ref3": # Specifically for empty <ref target="#ref3"/>
-                self.assertTrue(len(ptr_info["context_text"]) > 0, f"Context text should be present for empty tag {target_id}")
+            if ptr_info.in_text_citation_string == f"[{ptr_info.target_id}]" and target_id == "ref3": # Specifically for empty <ref target="#ref3"/>
+                self.assertTrue(len(ptr_info.context_text) > 0, f"Context text should be present for empty tag {target_id}")
             else:
-                self.assertIn(ptr_info["in_text_citation_string"], ptr_info["context_text"])
+                self.assertIn(ptr_info.in_text_citation_string, ptr_info.context_text)
 
             if target_id == "ref3": # Empty ref - check generated text
-                 self.assertTrue(ptr_info["in_text_citation_string"].startswith("[") and ptr_info["in_text_citation_string"].endswith("]"))
+                 self.assertTrue(ptr_info.in_text_citation_string.startswith("[") and ptr_info.in_text_citation_string.endswith("]"))
 
         self.assertEqual(found_targets, set(expected_pointers_summary.keys()), "Not all expected TEI targets were found.")
 
@@ -192,7 +301,7 @@ class TestXMLParser(unittest.TestCase):
         </article>
         """
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
 
         bib_map = parser.get_bibliography_map() # Call this to allow bibliography_format_used to be set by parsing.
         self.assertEqual(parser.schema_type, "wiley", f"Initial schema detection failed for Wiley. Detected: {parser.schema_type}. BibMap: {bib_map}")
@@ -231,22 +340,38 @@ class TestXMLParser(unittest.TestCase):
 
         found_targets_wiley = set()
         for ptr_info in contextual_pointers:
-            self.assertIn("target_id", ptr_info)
-            target_id = ptr_info["target_id"]
+            self.assertTrue(hasattr(ptr_info, "target_id"))
+            target_id = ptr_info.target_id
             found_targets_wiley.add(target_id)
 
             self.assertIn(target_id, expected_pointers_summary, f"Unexpected Wiley target_id {target_id} found in {ptr_info}")
             expected = expected_pointers_summary[target_id]
-            self.assertEqual(ptr_info["in_text_citation_string"], expected["text"])
-            self.assertEqual(ptr_info["citation_tag_name"], expected["tag"])
+            self.assertEqual(ptr_info.in_text_citation_string, expected["text"])
+            self.assertEqual(ptr_info.citation_tag_name, expected["tag"])
 
-            if ptr_info["in_text_citation_string"] == f"[{ptr_info['target_id']}]" and target_id == "w4": # Specifically for empty <link href="#w4"/>
-                self.assertTrue(len(ptr_info["context_text"]) > 0, f"Context text should be present for empty tag {target_id}")
+            if ptr_info.in_text_citation_string == f"[{ptr_info.target_id}]" and target_id == "w4": # Specifically for empty <link href="#w4"/>
+                self.assertTrue(len(ptr_info.context_text) > 0, f"Context text should be present for empty tag {target_id}")
             else:
-                self.assertIn(ptr_info["in_text_citation_string"], ptr_info["context_text"])
+                self.assertIn(ptr_info.in_text_citation_string, ptr_info.context_text)
 
         self.assertEqual(found_targets_wiley, set(expected_pointers_summary.keys()), "Not all expected Wiley targets were found.")
 
+    def test_wiley_pointers_with_default_namespace(self):
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+        <component xmlns="http://www.wiley.com/namespaces/wiley" type="serialArticle">
+            <body><p>Namespaced Wiley text (Author, <link href="#bib1">2019</link>).</p></body>
+            <bibliography><bib xml:id="bib1"><citation>Namespaced reference.</citation></bib></bibliography>
+        </component>
+        """
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.schema_type, "wiley")
+        contextual_pointers = parser.get_pointer_map()
+        self.assertEqual(len(contextual_pointers), 1, f"Expected 1 pointer, got {contextual_pointers}")
+        self.assertEqual(contextual_pointers[0].target_id, "bib1")
+        self.assertEqual(contextual_pointers[0].citation_tag_name, "link")
+        self.assertEqual(contextual_pointers[0].in_text_citation_string, "2019")
+        self.assertIn("Namespaced Wiley text (Author, 2019 ).", contextual_pointers[0].context_text)
+
     def test_bioc_parsing(self):
         xml_content = """<?xml version="1.0" encoding="UTF-8"?>
         <collection>
@@ -281,7 +406,7 @@ class TestXMLParser(unittest.TestCase):
         # Need to adjust _parse_bib_bioc to potentially use 'bioc_id_for_ref' as key if available.
         # For now, this test will assume keys are 'bib1', 'bib2' from annotations.
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
 
         # The _parse_bib_bioc creates numeric keys by default.
         # For this test to work with symbolic keys like "bib1", "bib2" from annotations,
@@ -331,22 +456,46 @@ class TestXMLParser(unittest.TestCase):
 
         found_targets_bioc = set()
         for ptr_info in contextual_pointers:
-            self.assertIn("target_id", ptr_info)
-            target_id = ptr_info["target_id"]
+            self.assertTrue(hasattr(ptr_info, "target_id"))
+            target_id = ptr_info.target_id
             found_targets_bioc.add(target_id)
 
             self.assertIn(target_id, expected_pointers_summary, f"Unexpected BioC target_id {target_id} found.")
-            self.assertEqual(ptr_info["in_text_citation_string"], expected_pointers_summary[target_id])
-            self.assertEqual(ptr_info["citation_tag_name"], "annotation")
+            self.assertEqual(ptr_info.in_text_citation_string, expected_pointers_summary[target_id])
+            self.assertEqual(ptr_info.citation_tag_name, "annotation")
             # Context for BioC annotations is tricky; the annotation itself is often within the context.
             # A simple check:
-            self.assertTrue(len(ptr_info["context_text"]) > 0, "BioC context text should not be empty")
-            self.assertIn(ptr_info["in_text_citation_string"], ptr_info["context_text"],
-                          f"BioC in-text string '{ptr_info['in_text_citation_string']}' not in context '{ptr_info['context_text']}'")
+            self.assertTrue(len(ptr_info.context_text) > 0, "BioC context text should not be empty")
+            self.assertIn(ptr_info.in_text_citation_string, ptr_info.context_text,
+                          f"BioC in-text string '{ptr_info.in_text_citation_string}' not in context '{ptr_info.context_text}'")
 
 
         self.assertEqual(found_targets_bioc, set(expected_pointers_summary.keys()), "Not all expected BioC targets were found.")
 
+    def test_bioc_citation_annotations(self):
+        xml_content = """<?xml version="1.0" encoding="UTF-8"?>
+        <collection>
+            <document>
+                <passage>
+                    <infon key="type">paragraph</infon>
+                    <text>Annotated paragraph <annotation id="A1"><infon key="type">citation</infon><infon key="rid">#bib1</infon><text>[1]</text></annotation> and more.</text>
+                    <annotation id="A2"><infon key="type">gene</infon><infon key="rid">bib9</infon><text>BRCA1</text></annotation>
+                    <annotation id="A3"><infon key="type">Citation</infon><infon key="target_id">bib2</infon></annotation>
+                </passage>
+                <passage>
+                    <infon key="section_type">REF</infon>
+                    <text>1. Annotated reference.</text>
+                </passage>
+            </document>
+        </collection>
+        """
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.schema_type, "bioc")
+        pointers = parser.get_pointer_map()
+        # Non-citation annotations are skipped, the type match is case-insensitive and '#' is dropped from targets
+        self.assertEqual([p.target_id for p in pointers], ["bib1", "bib2"])
+        self.assertEqual(pointers[1].in_text_citation_string, "[bib2]")
+
     def test_fallback_full_text_exclusion(self):
         # Simplified XML to isolate the <references> tag issue
         xml_content = """<?xml version="1.0"?>
@@ -357,7 +506,7 @@ class TestXMLParser(unittest.TestCase):
         </root>
         """
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
         parser.schema_type = "unknown"
 
         # Temporarily add specific logging call in the test if needed,
@@ -373,6 +522,24 @@ class TestXMLParser(unittest.TestCase):
             self.skipTest("Known issue: GenericFallbackParser not removing <references> content reliably in this test.")
         self.assertNotIn("Ref B content.", full_text, "Content from <ref-list> should be excluded.") # This one works
 
+    def test_fallback_bibliography_uses_present_container(self):
+        xml_content = """<?xml version="1.0"?>
+        <root>
+            <p>Body.</p>
+            <listBibl>
+                <biblStruct xml:id="b0"><note type="raw_reference">Generic TEI-style ref.</note></biblStruct>
+            </listBibl>
+        </root>
+        """
+        parser = self._write_xml_and_parse(xml_content)
+        self.assertEqual(parser.schema_type, "unknown")
+        bib_map = parser.specific_parser_instance.parse_bibliography()
+        self.assertEqual(bib_map, {"b0": "Generic TEI-style ref."})
+        self.assertIs(parser.get_bibliography_map(), bib_map)
+        self.assertEqual(parser.bibliography_format_used, "tei")
+        # Only the strategy with evidence in the document was ever built
+        self.assertEqual([cls.__name__ for cls in parser.specific_parser_instance._concrete_parsers], ["TEIParser"])
+
     def test_fallback_pointer_map_generic(self):
         xml_content = """<?xml version="1.0"?>
         <root>
@@ -389,7 +556,7 @@ class TestXMLParser(unittest.TestCase):
         </root>
         """
         parser = self._write_xml_and_parse(xml_content)
-        self.assertTrue(parser.soup is not None, "Soup object should not be None")
+        self.assertTrue(parser.root is not None, "Root element should not be None")
         # Force schema_type to test fallback logic in get_pointer_map
         parser.schema_type = "unknown"
 
@@ -405,21 +572,60 @@ class TestXMLParser(unittest.TestCase):
 
         found_targets_fallback = set()
         for ptr_info in contextual_pointers:
-            self.assertIn("target_id", ptr_info)
-            target_id = ptr_info["target_id"]
+            self.assertTrue(hasattr(ptr_info, "target_id"))
+            target_id = ptr_info.target_id
             found_targets_fallback.add(target_id)
 
             self.assertIn(target_id, expected_pointers_summary, f"Unexpected fallback target_id {target_id} found.")
             expected = expected_pointers_summary[target_id]
-            self.assertEqual(ptr_info["in_text_citation_string"], expected["text"])
-            self.assertEqual(ptr_info["citation_tag_name"], expected["tag"])
+            self.assertEqual(ptr_info.in_text_citation_string, expected["text"])
+            self.assertEqual(ptr_info.citation_tag_name, expected["tag"])
 
-            if ptr_info["in_text_citation_string"] == f"[{ptr_info['target_id']}]" and target_id == "r3": # Specifically for empty <ref type="bibr" target="#r3"/>
-                self.assertTrue(len(ptr_info["context_text"]) > 0, f"Context text should be present for empty tag {target_id}")
+            if ptr_info.in_text_citation_string == f"[{ptr_info.target_id}]" and target_id == "r3": # Specifically for empty <ref type="bibr" target="#r3"/>
+                self.assertTrue(len(ptr_info.context_text) > 0, f"Context text should be present for empty tag {target_id}")
             else:
-                self.assertIn(ptr_info["in_text_citation_string"], ptr_info["context_text"])
+                self.assertIn(ptr_info.in_text_citation_string, ptr_info.context_text)
 
         self.assertEqual(found_targets_fallback, set(expected_pointers_summary.keys()), "Not all expected fallback targets were found.")
 
+class TestXMLParserBatch(unittest.TestCase):
+
+    def setUp(self):
+        here = os.path.dirname(os.path.abspath(__file__))
+        self.paths = [os.path.join(here, "sample_jats.xml"), os.path.join(here, "sample_tei.xml")]
+
+    def test_extract_pointers_batch_matches_serial(self):
+        serial = [extract_pointers(p) for p in self.paths]
+        self.assertTrue(all(serial), "Both sample files should yield pointers")
+        self.assertEqual(extract_pointers_batch(self.paths, max_workers=2), serial)
+
+    def test_parse_xml_batch_matches_serial(self):
+        serial = [parse_one_xml(p) for p in self.paths]
+        for result in serial:
+            self.assertEqual(set(result), {"bib", "text", "pointers"})
+            self.assertTrue(result["bib"] and result["text"] and result["pointers"])
+        self.assertEqual(parse_xml_batch(self.paths, max_workers=2), serial)
+
+    def test_xml_parser_batch_matches_parse_all(self):
+        serial = [XMLParser(p).parse_all() for p in self.paths]
+        self.assertEqual(XMLParser.batch(self.paths, workers=2), serial)
+
+    def test_parse_paths_streaming_matches_serial(self):
+        paths = self.paths + [os.path.join(os.path.dirname(self.paths[0]), "does_not_exist.xml")]
+        streamed = list(parse_paths_streaming(paths, io_workers=2, prefetch=1))
+        self.assertEqual([p for p, _ in streamed], paths)
+        for path, parser in streamed[:2]:
+            serial = XMLParser(path)
+            self.assertEqual(parser.schema_type, serial.schema_type)
+            self.assertEqual(parser.get_bibliography_map(), serial.get_bibliography_map())
+            self.assertEqual(parser.get_full_text(), serial.get_full_text())
+            self.assertEqual(parser.get_pointer_map(), serial.get_pointer_map())
+        self.assertIsNone(streamed[2][1].root)
+
+    def test_parse_paths_streaming_without_read_ahead(self):
+        streamed = list(parse_paths_streaming(self.paths, prefetch=0))
+        self.assertEqual([p for p, _ in streamed], self.paths)
+        self.assertEqual([parser.schema_type for _, parser in streamed], ["jats", "tei"])
+
 if __name__ == '__main__':
     unittest.main()
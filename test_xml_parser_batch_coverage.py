@@ -68,7 +68,7 @@ if total_files > 0:
             'pointer_map_success': False, 'pointer_map_len': 0
         }
 
-        if parser.soup is None:
+        if parser.root is None:
             processing_results.append(result_entry)
             continue
 
@@ -119,7 +119,7 @@ if total_files > 0:
     pointer_map_success_rate = (pointer_map_success_count / total_files) * 100
     print(f"Pointer Map Extraction Success (non-empty): {pointer_map_success_count}/{total_files} ({pointer_map_success_rate:.2f}%)")
 
-    print("\n--- BS4 Parser Usage (Overall, for files where soup was not None) ---")
+    print("\n--- Parser Usage (Overall, for files where root was not None) ---")
     if parser_usage_stats:
         for parser_name, count in parser_usage_stats.items():
             print(f"  - {parser_name}: {count} files")